@@ -4,433 +4,599 @@ Tab Regulator - Extract all open browser tabs to a text file
 Works with Chrome, Firefox, and other browsers without closing them.
 """
 
+import hashlib
 import json
 import os
 import platform
+import re
 import subprocess
-import sqlite3
-import shutil
+import time
+import urllib.request
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 import argparse
 
+# Optional accelerators: lz4 unlocks direct Firefox session-store parsing,
+# orjson speeds up JSON handling. Both degrade gracefully when missing.
+try:
+    import lz4.block
+except ImportError:
+    lz4 = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# ASCII record/unit separators used as delimiters in the AppleScript output
+# (character id 30 / 31), so titles containing commas or quotes can't
+# corrupt the parse the way the old comma-splitting did.
+RECORD_SEP = '\x1e'
+UNIT_SEP = '\x1f'
+
+# How long (seconds) a cached extraction stays valid for repeat invocations
+CACHE_TTL = 30
+
+# URL prefixes of common "empty" tabs that shouldn't be tracked
+IGNORED_PREFIXES = (
+    'chrome://newtab/',
+    'chrome-extension://',
+    'about:blank',
+    'edge://newtab/',
+    'safari://newtab/',
+)
+
+# Supported browsers: label -> (AppleScript application name, tab title
+# property, macOS process name). Safari calls the title property "name";
+# everything else is Chromium-like enough to share one script template.
+_BROWSERS = {
+    'Chrome': ('Google Chrome', 'title', 'Google Chrome'),
+    'Brave': ('Brave Browser', 'title', 'Brave Browser'),
+    'Firefox': ('Firefox', 'title', 'firefox'),
+    'Safari': ('Safari', 'name', 'Safari'),
+}
+
+# One AppleScript block per browser, all stamped from the same template.
+# Each block is guarded by "is running" (which does not launch the app),
+# so they can be concatenated into a single osascript invocation instead
+# of spawning one or two subprocesses per browser. The whole tell sits in
+# its own try so one browser failing (automation permission denied, or an
+# app whose scripting dictionary has no tabs) contributes nothing instead
+# of aborting the combined script and losing every browser's tabs.
+_APPLESCRIPT_BLOCK_TEMPLATE = '''
+    if application "{app}" is running then
+        try
+            tell application "{app}"
+                repeat with w in windows
+                    repeat with t in tabs of w
+                        try
+                            set output to output & "{label}" & (character id 31) & ({title_prop} of t) & (character id 31) & (URL of t) & (character id 30)
+                        end try
+                    end repeat
+                end repeat
+            end tell
+        end try
+    end if
+'''
+
+_APPLESCRIPT_BLOCKS = {
+    label: _APPLESCRIPT_BLOCK_TEMPLATE.format(app=app, label=label,
+                                              title_prop=title_prop)
+    for label, (app, title_prop, _) in _BROWSERS.items()
+}
+
+_PROCESS_NAMES = {label: process for label, (_, _, process) in _BROWSERS.items()}
+
+
+def _parse_tab_records(output):
+    """Parse RECORD_SEP/UNIT_SEP delimited osascript output into tab dicts"""
+    tabs = []
+    for record in output.strip().split(RECORD_SEP):
+        parts = record.split(UNIT_SEP)
+        if len(parts) != 3:
+            continue
+        browser, title, url = parts
+        url = url.strip()
+        if not url:
+            continue
+        tabs.append({'title': title.strip(), 'url': url, 'browser': browser})
+    return tabs
+
 
 class TabExtractor:
     def __init__(self):
         self.system = platform.system()
         self.tabs = []
-    
-    def get_chrome_tabs(self):
-        """Extract tabs from Google Chrome"""
+        self._cache_path = Path.home() / '.cache/tab_regulator/tabs.json'
+        self._compiled_scripts = {}
+
+    def _compiled_script_path(self, source):
+        """Return a cached compiled .scpt for source, compiling on first use
+
+        Returns None if osacompile is unavailable or fails, in which case
+        the caller falls back to interpreting the source directly.
+        """
+        if source in self._compiled_scripts:
+            return self._compiled_scripts[source]
+
+        compiled = None
         try:
-            if self.system == "Darwin":  # macOS
-                # First check if Chrome is running and has windows
-                check_script = '''
-                tell application "System Events"
-                    if exists (processes where name is "Google Chrome") then
-                        tell application "Google Chrome"
-                            if (count of windows) > 0 then
-                                return "ready"
-                            else
-                                return "no_windows"
-                            end if
-                        end tell
-                    else
-                        return "not_running"
-                    end if
-                end tell
-                '''
-                check_result = subprocess.run(['osascript', '-e', check_script], 
-                                            capture_output=True, text=True)
-                
-                if check_result.returncode == 0:
-                    status = check_result.stdout.strip()
-                    if status == "not_running":
-                        return False
-                    elif status == "no_windows":
-                        print("Chrome is running but has no windows open")
-                        return False
-                    elif status == "ready":
-                        # Use AppleScript to get Chrome tabs
-                        script = '''
-                        tell application "Google Chrome"
-                            set tab_list to {}
-                            repeat with w in windows
-                                repeat with t in tabs of w
-                                    try
-                                        set tab_info to (title of t & " ||| " & URL of t)
-                                        set end of tab_list to tab_info
-                                    end try
-                                end repeat
-                            end repeat
-                            return tab_list
-                        end tell
-                        '''
-                        result = subprocess.run(['osascript', '-e', script], 
-                                              capture_output=True, text=True)
-                        if result.returncode == 0 and result.stdout.strip():
-                            tabs_output = result.stdout.strip()
-                            if tabs_output and tabs_output != "":
-                                # Handle the case where AppleScript returns a comma-separated list
-                                if tabs_output.startswith('{') and tabs_output.endswith('}'):
-                                    tabs_output = tabs_output[1:-1]  # Remove braces
-                                tabs = [tab.strip().strip('"') for tab in tabs_output.split(',')]
-                                
-                                for tab in tabs:
-                                    if ' ||| ' in tab:
-                                        title, url = tab.split(' ||| ', 1)
-                                        self.tabs.append({'title': title.strip(), 'url': url.strip(), 'browser': 'Chrome'})
-                                return True
-                return False
-            
-            elif self.system == "Windows":
-                # Try using PowerShell for Windows Chrome
-                script = '''
-                Add-Type -AssemblyName System.Windows.Forms
-                $chrome = Get-Process chrome -ErrorAction SilentlyContinue
-                if ($chrome) {
-                    # This is a simplified approach - Windows automation is more complex
-                    Write-Host "Chrome detected but tab extraction requires additional setup"
-                }
-                '''
-                # Windows implementation would be more complex
-                print("Windows Chrome tab extraction requires additional setup")
-                return False
-                
+            cache_dir = Path.home() / 'Library/Caches/tab_regulator'
+            cache_dir.mkdir(parents=True, exist_ok=True)
+            digest = hashlib.sha1(source.encode('utf-8')).hexdigest()
+            path = cache_dir / f'{digest}.scpt'
+            if path.exists():
+                compiled = path
+            else:
+                source_path = path.with_suffix('.applescript')
+                source_path.write_text(source, encoding='utf-8')
+                result = subprocess.run(
+                    ['osacompile', '-o', str(path), str(source_path)],
+                    capture_output=True)
+                source_path.unlink(missing_ok=True)
+                if result.returncode == 0:
+                    compiled = path
+        except OSError:
+            compiled = None
+
+        self._compiled_scripts[source] = compiled
+        return compiled
+
+    def _run_osascript(self, source):
+        """Run an AppleScript, skipping the parse stage via a compiled cache"""
+        compiled = self._compiled_script_path(source)
+        if compiled is not None:
+            return subprocess.run(['osascript', str(compiled)],
+                                  capture_output=True)
+        return subprocess.run(['osascript', '-'],
+                              input=source.encode('utf-8'),
+                              capture_output=True)
+
+    def _running_browsers(self):
+        """Detect every running browser with a single ps sweep
+
+        Returns the set of browser labels whose process is up. Falls back
+        to "assume all running" if ps misbehaves; the AppleScript
+        'is running' guard still protects the actual query.
+        """
+        try:
+            result = subprocess.run(['ps', '-Ao', 'comm='], capture_output=True)
+            if result.returncode != 0:
+                return set(_PROCESS_NAMES)
+            names = {os.path.basename(line.strip()) for line in
+                     result.stdout.decode('utf-8', errors='replace').splitlines()}
+            return {label for label, process in _PROCESS_NAMES.items()
+                    if process in names}
+        except Exception:
+            return set(_PROCESS_NAMES)
+
+    def _collect_applescript_tabs(self, browsers=None):
+        """Collect tabs from the requested browsers with a single osascript call"""
+        if self.system != "Darwin":
+            return []
+
+        if browsers is None:
+            browsers = list(_APPLESCRIPT_BLOCKS)
+
+        # Skip browsers that aren't even running so the generated script
+        # stays small, and skip osascript entirely when none of them are.
+        running = self._running_browsers()
+        browsers = [b for b in browsers if b in running]
+        if not browsers:
+            return []
+
+        script = '\n'.join(
+            ['set output to ""']
+            + [_APPLESCRIPT_BLOCKS[browser] for browser in browsers]
+            + ['return output']
+        )
+
+        try:
+            result = self._run_osascript(script)
         except Exception as e:
-            print(f"Error extracting Chrome tabs: {e}")
-            return False
-    
-    def get_firefox_tabs(self):
-        """Extract tabs from Firefox using session store"""
+            print(f"Error extracting tabs: {e}")
+            return []
+
+        if result.returncode != 0 or not result.stdout:
+            return []
+
+        # Decode the captured bytes in one bulk call rather than letting
+        # text=True route them through an incremental TextIOWrapper decode.
+        output = result.stdout.decode('utf-8', errors='replace')
+        if not output.strip():
+            return []
+
+        return _parse_tab_records(output)
+
+    def _get_all_tabs_applescript(self, browsers=None):
+        """Extract tabs from the requested browsers into self.tabs
+
+        Returns the number of tabs added (0 on failure), so callers can
+        report counts without rescanning self.tabs.
+        """
+        tabs = self._collect_applescript_tabs(browsers)
+        self.tabs.extend(tabs)
+        return len(tabs)
+
+    def _collect_cdp_tabs(self, port=9222, browser='Chrome'):
+        """Collect tabs from a Chromium DevTools endpoint, if one is listening
+
+        Only works when the browser was started with
+        --remote-debugging-port; one HTTP GET then replaces the whole
+        per-tab AppleEvent dance and works on any platform.
+        """
         try:
-            if self.system == "Darwin":  # macOS
-                profile_path = Path.home() / "Library/Application Support/Firefox/Profiles"
-            elif self.system == "Windows":
-                profile_path = Path.home() / "AppData/Roaming/Mozilla/Firefox/Profiles"
-            elif self.system == "Linux":
-                profile_path = Path.home() / ".mozilla/firefox"
-            else:
-                return False
-            
-            if not profile_path.exists():
-                return False
-            
-            # Find the default profile
-            for profile_dir in profile_path.iterdir():
-                if profile_dir.is_dir() and "default" in profile_dir.name.lower():
-                    session_file = profile_dir / "sessionstore-backups/recovery.jsonlz4"
-                    if not session_file.exists():
-                        session_file = profile_dir / "sessionstore.jsonlz4"
-                    
-                    if session_file.exists():
-                        # Firefox uses LZ4 compression, which is complex to handle
-                        # For now, we'll use AppleScript on macOS
-                        if self.system == "Darwin":
-                            return self.get_firefox_tabs_applescript()
-            
-            return False
-            
+            url = f"http://localhost:{port}/json"
+            with urllib.request.urlopen(url, timeout=1) as response:
+                data = response.read()
+            pages = orjson.loads(data) if orjson is not None else json.loads(data)
+        except (OSError, ValueError):
+            # No debug endpoint (connection refused) or unexpected payload
+            return []
+
+        return [{'title': page.get('title', ''), 'url': page['url'],
+                 'browser': browser}
+                for page in pages
+                if page.get('type') == 'page' and page.get('url')]
+
+    def get_chrome_tabs(self):
+        """Extract tabs from Google Chrome
+
+        Returns the number of tabs added (0 on failure).
+        """
+        if self.system == "Windows":
+            tabs = self._collect_cdp_tabs()
+            if not tabs:
+                print("Windows Chrome tab extraction requires Chrome to be "
+                      "started with --remote-debugging-port=9222")
+            self.tabs.extend(tabs)
+            return len(tabs)
+
+        tabs = self._collect_cdp_tabs() or self._collect_applescript_tabs(['Chrome'])
+        self.tabs.extend(tabs)
+        return len(tabs)
+
+    def _find_firefox_session_file(self):
+        """Locate the session store file of the default Firefox profile"""
+        if self.system == "Darwin":  # macOS
+            profile_path = Path.home() / "Library/Application Support/Firefox/Profiles"
+        elif self.system == "Windows":
+            profile_path = Path.home() / "AppData/Roaming/Mozilla/Firefox/Profiles"
+        elif self.system == "Linux":
+            profile_path = Path.home() / ".mozilla/firefox"
+        else:
+            return None
+
+        if not profile_path.exists():
+            return None
+
+        # Find the default profile
+        for profile_dir in profile_path.iterdir():
+            if profile_dir.is_dir() and "default" in profile_dir.name.lower():
+                session_file = profile_dir / "sessionstore-backups/recovery.jsonlz4"
+                if not session_file.exists():
+                    session_file = profile_dir / "sessionstore.jsonlz4"
+                if session_file.exists():
+                    return session_file
+
+        return None
+
+    def _collect_firefox_tabs(self):
+        """Collect Firefox tabs into a local list (session store, then AppleScript)"""
+        try:
+            session_file = self._find_firefox_session_file()
+            if session_file is not None and lz4 is not None:
+                # Firefox's mozLz4 format: 8-byte magic, 4-byte little-endian
+                # uncompressed size, then a raw LZ4 block. Decoding it directly
+                # avoids another osascript spawn and works even when Firefox
+                # isn't scriptable (or we're not on macOS).
+                data = session_file.read_bytes()
+                if data[:8] != b'mozLz40\x00':
+                    raise ValueError(f"Unexpected session store magic in {session_file}")
+                raw = lz4.block.decompress(
+                    data[12:],
+                    uncompressed_size=int.from_bytes(data[8:12], 'little'))
+                doc = orjson.loads(raw) if orjson is not None else json.loads(raw)
+
+                tabs = []
+                for win in doc.get('windows', []):
+                    for tab in win.get('tabs', []):
+                        entries = tab.get('entries')
+                        if not entries:
+                            continue
+                        entry = entries[tab.get('index', len(entries)) - 1]
+                        if not entry.get('url'):
+                            continue
+                        tabs.append({'title': entry.get('title', ''),
+                                     'url': entry['url'],
+                                     'browser': 'Firefox'})
+                return tabs
+
+            # Fall back to AppleScript when the session file (or lz4) is absent
+            if self.system == "Darwin":
+                return self._collect_applescript_tabs(['Firefox'])
+            return []
+
         except Exception as e:
             print(f"Error extracting Firefox tabs: {e}")
-            return False
-    
+            return []
+
+    def get_firefox_tabs(self):
+        """Extract tabs from Firefox using session store
+
+        Returns the number of tabs added (0 on failure).
+        """
+        tabs = self._collect_firefox_tabs()
+        self.tabs.extend(tabs)
+        return len(tabs)
+
     def get_firefox_tabs_applescript(self):
         """Extract Firefox tabs using AppleScript on macOS"""
-        try:
-            script = '''
-            tell application "Firefox"
-                set tab_list to {}
-                repeat with w in windows
-                    repeat with t in tabs of w
-                        set end of tab_list to (title of t & " | " & URL of t)
-                    end repeat
-                end repeat
-                return tab_list
-            end tell
-            '''
-            result = subprocess.run(['osascript', '-e', script], 
-                                  capture_output=True, text=True)
-            if result.returncode == 0:
-                tabs = result.stdout.strip().split('\n')
-                for tab in tabs:
-                    if ' | ' in tab:
-                        title, url = tab.split(' | ', 1)
-                        self.tabs.append({'title': title.strip(), 'url': url.strip(), 'browser': 'Firefox'})
-                return True
-        except Exception as e:
-            print(f"Error with Firefox AppleScript: {e}")
-            return False
-    
+        return self._get_all_tabs_applescript(['Firefox'])
+
     def get_safari_tabs(self):
         """Extract tabs from Safari on macOS"""
-        if self.system != "Darwin":
-            return False
-            
-        try:
-            # First check if Safari is running and has windows
-            check_script = '''
-            tell application "System Events"
-                if exists (processes where name is "Safari") then
-                    tell application "Safari"
-                        if (count of windows) > 0 then
-                            return "ready"
-                        else
-                            return "no_windows"
-                        end if
-                    end tell
-                else
-                    return "not_running"
-                end if
-            end tell
-            '''
-            check_result = subprocess.run(['osascript', '-e', check_script], 
-                                        capture_output=True, text=True)
-            
-            if check_result.returncode == 0:
-                status = check_result.stdout.strip()
-                if status == "not_running":
-                    return False
-                elif status == "no_windows":
-                    print("Safari is running but has no windows open")
-                    return False
-                elif status == "ready":
-                    script = '''
-                    tell application "Safari"
-                        set tab_list to {}
-                        repeat with w in windows
-                            repeat with t in tabs of w
-                                try
-                                    set tab_info to (name of t & " ||| " & URL of t)
-                                    set end of tab_list to tab_info
-                                end try
-                            end repeat
-                        end repeat
-                        return tab_list
-                    end tell
-                    '''
-                    result = subprocess.run(['osascript', '-e', script], 
-                                          capture_output=True, text=True)
-                    if result.returncode == 0 and result.stdout.strip():
-                        tabs_output = result.stdout.strip()
-                        if tabs_output and tabs_output != "":
-                            # Handle the case where AppleScript returns a comma-separated list
-                            if tabs_output.startswith('{') and tabs_output.endswith('}'):
-                                tabs_output = tabs_output[1:-1]  # Remove braces
-                            tabs = [tab.strip().strip('"') for tab in tabs_output.split(',')]
-                            
-                            for tab in tabs:
-                                if ' ||| ' in tab:
-                                    title, url = tab.split(' ||| ', 1)
-                                    self.tabs.append({'title': title.strip(), 'url': url.strip(), 'browser': 'Safari'})
-                            return True
-            return False
-            
-        except Exception as e:
-            print(f"Error extracting Safari tabs: {e}")
-            return False
-    
+        return self._get_all_tabs_applescript(['Safari'])
+
     def get_brave_tabs(self):
         """Extract tabs from Brave Browser (similar to Chrome)"""
+        return self._get_all_tabs_applescript(['Brave'])
+
+    def _load_cached_tabs(self):
+        """Return the cached tab list if it is still fresh, else None"""
         try:
-            if self.system == "Darwin":  # macOS
-                # First check if Brave is running and has windows
-                check_script = '''
-                tell application "System Events"
-                    if exists (processes where name is "Brave Browser") then
-                        tell application "Brave Browser"
-                            if (count of windows) > 0 then
-                                return "ready"
-                            else
-                                return "no_windows"
-                            end if
-                        end tell
-                    else
-                        return "not_running"
-                    end if
-                end tell
-                '''
-                check_result = subprocess.run(['osascript', '-e', check_script], 
-                                            capture_output=True, text=True)
-                
-                if check_result.returncode == 0:
-                    status = check_result.stdout.strip()
-                    if status == "ready":
-                        # Use AppleScript to get Brave tabs
-                        script = '''
-                        tell application "Brave Browser"
-                            set tab_list to {}
-                            repeat with w in windows
-                                repeat with t in tabs of w
-                                    try
-                                        set tab_info to (title of t & " ||| " & URL of t)
-                                        set end of tab_list to tab_info
-                                    end try
-                                end repeat
-                            end repeat
-                            return tab_list
-                        end tell
-                        '''
-                        result = subprocess.run(['osascript', '-e', script], 
-                                              capture_output=True, text=True)
-                        if result.returncode == 0 and result.stdout.strip():
-                            tabs_output = result.stdout.strip()
-                            if tabs_output and tabs_output != "":
-                                # Handle the case where AppleScript returns a comma-separated list
-                                if tabs_output.startswith('{') and tabs_output.endswith('}'):
-                                    tabs_output = tabs_output[1:-1]  # Remove braces
-                                tabs = [tab.strip().strip('"') for tab in tabs_output.split(',')]
-                                
-                                for tab in tabs:
-                                    if ' ||| ' in tab:
-                                        title, url = tab.split(' ||| ', 1)
-                                        self.tabs.append({'title': title.strip(), 'url': url.strip(), 'browser': 'Brave'})
-                                return True
-                return False
-        except Exception as e:
-            print(f"Error extracting Brave tabs: {e}")
-            return False
+            if time.time() - self._cache_path.stat().st_mtime > CACHE_TTL:
+                return None
+            data = self._cache_path.read_bytes()
+            doc = orjson.loads(data) if orjson is not None else json.loads(data)
+            return doc.get('tabs') or None
+        except (OSError, ValueError):
+            return None
 
-    def extract_all_tabs(self):
-        """Extract tabs from all supported browsers"""
+    def _store_cached_tabs(self):
+        """Cache the current tab list so rapid re-runs skip extraction"""
+        if not self.tabs:
+            return
+        try:
+            self._cache_path.parent.mkdir(parents=True, exist_ok=True)
+            payload = {'tabs': self.tabs}
+            if orjson is not None:
+                data = orjson.dumps(payload)
+            else:
+                data = json.dumps(payload).encode('utf-8')
+            self._cache_path.write_bytes(data)
+        except OSError:
+            # Caching is best-effort; extraction already succeeded
+            pass
+
+    def extract_all_tabs(self, use_cache=False):
+        """Extract tabs from all supported browsers
+
+        use_cache=True (the --cached flag) serves a recent extraction from
+        the result cache when one is fresh; the default always re-probes,
+        since a cached list can miss tabs opened in the last few seconds.
+        """
         print("Extracting tabs from browsers...")
-        
+
+        # Rapid re-invocations (shell hotkey, back-to-back runs) reuse the
+        # last extraction instead of paying the full probe cost again.
+        if use_cache:
+            cached = self._load_cached_tabs()
+            if cached is not None:
+                self.tabs.extend(cached)
+                counts = Counter(tab['browser'] for tab in cached)
+                return self._report_extraction(counts, cached=True)
+
+        # Firefox is read straight from its session store where possible;
+        # only the remaining browsers need the AppleScript pass.
+        firefox_native = (self._find_firefox_session_file() is not None
+                          and lz4 is not None)
+        applescript_browsers = list(_APPLESCRIPT_BLOCKS)
+        if firefox_native:
+            applescript_browsers.remove('Firefox')
+
+        # Chrome with a DevTools endpoint answers in one HTTP round-trip
+        # (connection refused is instant when the port isn't open), so probe
+        # it before deciding what the AppleScript pass still has to cover.
+        cdp_tabs = self._collect_cdp_tabs()
+        if cdp_tabs:
+            applescript_browsers.remove('Chrome')
+
+        # The producers block on independent I/O (an osascript subprocess and
+        # a session-store read), so overlap them. Each returns a local list
+        # and the merge happens here, keeping self.tabs lock-free.
+        # Tally per-browser counts as each producer's result is merged, so
+        # reporting never has to rescan self.tabs.
+        counts = Counter()
+        counts.update(tab['browser'] for tab in cdp_tabs)
+        self.tabs.extend(cdp_tabs)
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            futures = [executor.submit(self._collect_applescript_tabs,
+                                       applescript_browsers)]
+            if firefox_native:
+                futures.append(executor.submit(self._collect_firefox_tabs))
+            # Merge in submission order (not completion order) so the
+            # browser grouping in self.tabs is stable run to run.
+            for future in futures:
+                tabs = future.result()
+                counts.update(tab['browser'] for tab in tabs)
+                self.tabs.extend(tabs)
+
+        self._store_cached_tabs()
+        return self._report_extraction(counts)
+
+    def _report_extraction(self, counts, cached=False):
+        """Print the per-browser summary and report overall success"""
         browsers_found = []
-        
-        # Try Chrome
-        if self.get_chrome_tabs():
-            browsers_found.append("Chrome")
-            print(f"✓ Found {len([t for t in self.tabs if t['browser'] == 'Chrome'])} Chrome tabs")
-        
-        # Try Brave
-        if self.get_brave_tabs():
-            browsers_found.append("Brave")
-            print(f"✓ Found {len([t for t in self.tabs if t['browser'] == 'Brave'])} Brave tabs")
-        
-        # Try Firefox
-        if self.get_firefox_tabs():
-            browsers_found.append("Firefox")
-            print(f"✓ Found {len([t for t in self.tabs if t['browser'] == 'Firefox'])} Firefox tabs")
-        
-        # Try Safari (macOS only)
-        if self.get_safari_tabs():
-            browsers_found.append("Safari")
-            print(f"✓ Found {len([t for t in self.tabs if t['browser'] == 'Safari'])} Safari tabs")
-        
+        for browser in _BROWSERS:
+            if counts[browser]:
+                browsers_found.append(browser)
+                print(f"✓ Found {counts[browser]} {browser} tabs")
+
         if not browsers_found:
             print("❌ No supported browsers found or no tabs could be extracted")
             print("Make sure your browser is running and try again")
             return False
-        
-        print(f"✓ Successfully extracted tabs from: {', '.join(browsers_found)}")
+
+        source = "cache" if cached else ", ".join(browsers_found)
+        print(f"✓ Successfully extracted tabs from: {source}")
         return True
-    
-    def load_previous_tabs(self, filename):
-        """Load previous tabs from file to compare"""
-        if not os.path.exists(filename):
+
+    def load_previous_tabs(self, filename, stat_result=None):
+        """Load previously recorded URLs to compare against
+
+        stat_result is the os.stat of the daily log (or None if absent),
+        computed once by the caller so no extra stat syscalls happen here.
+        """
+        # Preferred source: the one-URL-per-line sidecar file, which avoids
+        # regex-scanning the whole human-readable log on every run.
+        try:
+            with open(filename + '.urls', 'r', encoding='utf-8') as f:
+                return set(line.rstrip('\n') for line in f)
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"Warning: Could not read previous tabs: {e}")
             return set()
-        
+
+        # One-time migration: fall back to scraping URLs out of the daily log
+        # written before the sidecar existed.
+        if stat_result is None or stat_result.st_size == 0:
+            return set()
+
         try:
             previous_urls = set()
             with open(filename, 'r', encoding='utf-8') as f:
                 content = f.read()
-                # Extract URLs from previous content
-                import re
-                url_pattern = r'https?://[^\s\n]+'
-                urls = re.findall(url_pattern, content)
+                urls = re.findall(r'https?://[^\s\n]+', content)
                 previous_urls.update(urls)
             return previous_urls
         except Exception as e:
             print(f"Warning: Could not read previous tabs: {e}")
             return set()
 
-    def save_to_file(self, filename=None):
-        """Save extracted tabs to a daily file with incremental updates"""
+    def save_to_file(self, filename=None, previous_urls=None):
+        """Save extracted tabs to a daily file with incremental updates
+
+        When a previous_urls set is supplied (watch mode), it is used as-is
+        instead of re-reading the log from disk, and newly recorded URLs are
+        added to it so the caller can reuse it on the next cycle.
+        """
         if not self.tabs:
             print("No tabs to save!")
             return False
-        
+
         now = datetime.now()
-        
+        # Format each timestamp flavour once up front; cron-style repeated
+        # runs otherwise pay for six strftime calls per save.
+        time_str = now.strftime("%H:%M:%S")
+        full_str = now.strftime("%Y-%m-%d %H:%M:%S")
+        header_str = now.strftime("%A, %B %d, %Y")
+
         if filename is None:
             # Use daily filename format: tabs_YYYY-MM-DD.txt
-            date_str = now.strftime("%Y-%m-%d")
-            filename = f"tabs_{date_str}.txt"
-        
-        # Load previous tabs to compare
-        previous_urls = self.load_previous_tabs(filename)
-        
-        # Create a more sophisticated comparison
-        # Filter out common "empty" tabs that shouldn't be tracked
-        ignored_urls = {
-            'chrome://newtab/',
-            'chrome-extension://',
-            'about:blank',
-            'edge://newtab/',
-            'safari://newtab/'
-        }
-        
-        # Filter for genuinely new/interesting tabs
-        current_urls = {tab['url'] for tab in self.tabs 
-                       if not any(ignored in tab['url'] for ignored in ignored_urls)}
+            filename = f"tabs_{full_str[:10]}.txt"
+
+        # Stat the daily log once; everything below branches on this instead
+        # of issuing its own os.path.exists calls.
+        try:
+            stat_result = os.stat(filename)
+        except FileNotFoundError:
+            stat_result = None
+        file_exists = stat_result is not None
+
+        # Load previous tabs to compare (unless the caller already has them)
+        if previous_urls is None:
+            previous_urls = self.load_previous_tabs(filename, stat_result)
+
+        # Split interesting tabs from ignored "empty" ones in a single pass;
+        # tuple-form startswith tries every prefix in one C call, and only
+        # matches actual prefixes (a title mentioning chrome://newtab in the
+        # middle of a URL no longer counts as ignored).
+        interesting_tabs = []
+        ignored_tabs = []
+        for tab in self.tabs:
+            if tab['url'].startswith(IGNORED_PREFIXES):
+                ignored_tabs.append(tab)
+            else:
+                interesting_tabs.append(tab)
+
+        # Filter for genuinely new tabs
+        current_urls = {tab['url'] for tab in interesting_tabs}
         new_urls = current_urls - previous_urls
-        
-        # Get tabs that are genuinely new (excluding boring ones)
-        new_tabs = [tab for tab in self.tabs 
-                   if tab['url'] in new_urls and 
-                   not any(ignored in tab['url'] for ignored in ignored_urls)]
-        
-        # Count filtered/ignored tabs for reporting
-        ignored_tabs = [tab for tab in self.tabs 
-                       if any(ignored in tab['url'] for ignored in ignored_urls)]
-        
-        # Count different types of ignored tabs
-        blank_tab_count = len([tab for tab in ignored_tabs 
-                             if 'newtab' in tab['url'] or 'about:blank' in tab['url']])
-        extension_tab_count = len([tab for tab in ignored_tabs 
-                                 if 'chrome-extension://' in tab['url']])
+        new_tabs = [tab for tab in interesting_tabs if tab['url'] in new_urls]
+
+        # Count different types of ignored tabs for reporting
+        blank_tab_count = sum(1 for tab in ignored_tabs
+                              if 'newtab' in tab['url'] or 'about:blank' in tab['url'])
+        extension_tab_count = sum(1 for tab in ignored_tabs
+                                  if 'chrome-extension://' in tab['url'])
         other_ignored_count = len(ignored_tabs) - blank_tab_count - extension_tab_count
-        
+
         try:
-            # Check if file exists to determine if we're appending
-            file_exists = os.path.exists(filename)
-            
-            with open(filename, 'a' if file_exists else 'w', encoding='utf-8') as f:
-                if not file_exists:
-                    # First run of the day - create header
-                    f.write(f"Daily Browser Tabs Log - {now.strftime('%A, %B %d, %Y')}\n")
-                    f.write("=" * 80 + "\n\n")
-                
-                if new_tabs:
-                    # Add timestamp separator only if there are new tabs
-                    f.write(f"{'=' * 20} {now.strftime('%H:%M:%S')} {'=' * 20}\n")
-                    f.write(f"Run at: {now.strftime('%Y-%m-%d %H:%M:%S')}\n")
-                    f.write(f"New/Changed tabs: {len(new_tabs)} (out of {len(self.tabs)} total)\n")
-                    f.write("-" * 60 + "\n")
-                    
-                    # Group new tabs by browser
-                    browsers = {}
-                    for tab in new_tabs:
-                        browser = tab['browser']
-                        if browser not in browsers:
-                            browsers[browser] = []
-                        browsers[browser].append(tab)
-                    
-                    for browser, tabs in browsers.items():
-                        if tabs:  # Only show browsers with new tabs
-                            f.write(f"\n{browser.upper()} - {len(tabs)} new tabs:\n")
-                            for i, tab in enumerate(tabs, 1):
-                                f.write(f"  {i:2d}. {tab['title']}\n")
-                                f.write(f"      {tab['url']}\n")
-                    
-                    f.write(f"\n")
-                else:
-                    # Just add a simple timestamp for no-new-tabs runs
-                    f.write(f"[{now.strftime('%H:%M:%S')}] No new tabs (all {len(self.tabs)} tabs already recorded)\n")
-            
+            # Assemble the whole entry in memory and write it once; dozens of
+            # small f.write calls each pay encoder and dispatch overhead.
+            parts = []
+
+            if not file_exists:
+                # First run of the day - create header
+                parts.append(f"Daily Browser Tabs Log - {header_str}\n")
+                parts.append("=" * 80 + "\n\n")
+
+            if new_tabs:
+                # Add timestamp separator only if there are new tabs
+                parts.append(f"{'=' * 20} {time_str} {'=' * 20}\n")
+                parts.append(f"Run at: {full_str}\n")
+                parts.append(f"New/Changed tabs: {len(new_tabs)} (out of {len(self.tabs)} total)\n")
+                parts.append("-" * 60 + "\n")
+
+                # Group new tabs by browser
+                browsers = defaultdict(list)
+                for tab in new_tabs:
+                    browsers[tab['browser']].append(tab)
+
+                for browser, tabs in browsers.items():
+                    parts.append(f"\n{browser.upper()} - {len(tabs)} new tabs:\n")
+                    for i, tab in enumerate(tabs, 1):
+                        parts.append(f"  {i:2d}. {tab['title']}\n")
+                        parts.append(f"      {tab['url']}\n")
+
+                parts.append("\n")
+            else:
+                # Just add a simple timestamp for no-new-tabs runs
+                parts.append(f"[{time_str}] No new tabs (all {len(self.tabs)} tabs already recorded)\n")
+
+            # Encode the whole entry once and push it through a raw fd,
+            # bypassing the TextIOWrapper/BufferedWriter stack entirely.
+            # O_APPEND also makes concurrent runs append atomically instead
+            # of interleaving within an entry.
+            data = memoryview(''.join(parts).encode('utf-8'))
+            fd = os.open(filename, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+            try:
+                while data:
+                    written = os.write(fd, data[:1 << 20])
+                    data = data[written:]
+            finally:
+                os.close(fd)
+
+            if new_tabs:
+                # Keep the sidecar URL index in sync; seed it with the
+                # migrated URLs the first time so nothing is lost.
+                sidecar = filename + '.urls'
+                urls_to_record = (previous_urls | new_urls
+                                  if not os.path.exists(sidecar) else new_urls)
+                with open(sidecar, 'a', encoding='utf-8') as f:
+                    f.write('\n'.join(urls_to_record) + '\n')
+                # Keep the caller's in-memory state current for watch mode
+                previous_urls.update(new_urls)
+
             # Enhanced reporting
             content_tabs = len(self.tabs) - len(ignored_tabs)
-            
+
             if new_tabs:
                 print(f"✅ Found {len(new_tabs)} new tabs out of {len(self.tabs)} total")
                 if ignored_tabs:
@@ -441,7 +607,7 @@ class TabExtractor:
                         ignored_details.append(f"{extension_tab_count} extension tabs")
                     if other_ignored_count > 0:
                         ignored_details.append(f"{other_ignored_count} other ignored tabs")
-                    
+
                     if ignored_details:
                         print(f"ℹ️  Ignored: {', '.join(ignored_details)}")
                 print(f"✅ Appended to daily file: {filename}")
@@ -455,49 +621,98 @@ class TabExtractor:
                         ignored_details.append(f"{extension_tab_count} extension tabs")
                     if other_ignored_count > 0:
                         ignored_details.append(f"{other_ignored_count} other ignored tabs")
-                    
+
                     if ignored_details:
                         print(f"ℹ️  Currently ignoring: {', '.join(ignored_details)}")
                 print(f"✅ Updated timestamp in: {filename}")
-            
+
             return True
-            
+
         except Exception as e:
             print(f"Error saving file: {e}")
             return False
 
 
+def watch_loop(extractor, args):
+    """Re-extract every N seconds, keeping seen URLs in memory between cycles"""
+    previous_urls = None
+    state_date = None
+
+    while True:
+        date_str = datetime.now().strftime("%Y-%m-%d")
+        if previous_urls is None or (args.output is None and date_str != state_date):
+            # First cycle, or the daily log rolled over at midnight:
+            # (re)seed the in-memory state from disk once.
+            filename = args.output or f"tabs_{date_str}.txt"
+            try:
+                stat_result = os.stat(filename)
+            except FileNotFoundError:
+                stat_result = None
+            previous_urls = extractor.load_previous_tabs(filename, stat_result)
+            state_date = date_str
+
+        extractor.tabs.clear()
+        # Skip the result cache: each cycle must genuinely re-probe, or a
+        # --watch interval shorter than the TTL would just replay the tabs
+        # this loop cached one cycle ago. Fresh results are still stored so
+        # one-shot runs alongside the watcher benefit.
+        if extractor.extract_all_tabs(use_cache=False):
+            extractor.save_to_file(args.output, previous_urls=previous_urls)
+
+        time.sleep(args.watch)
+
+
 def main():
     parser = argparse.ArgumentParser(description="Extract browser tabs to a text file")
     parser.add_argument("-o", "--output", help="Output filename (default: browser_tabs_TIMESTAMP.txt)")
     parser.add_argument("--json", action="store_true", help="Also save as JSON format")
-    
+    parser.add_argument("--watch", type=int, metavar="SECONDS",
+                        help="Keep running, re-extracting every SECONDS seconds")
+    parser.add_argument("--cached", action="store_true",
+                        help=f"Reuse an extraction up to {CACHE_TTL}s old "
+                             "instead of re-probing the browsers")
+
     args = parser.parse_args()
-    
+
     extractor = TabExtractor()
-    
-    if extractor.extract_all_tabs():
+
+    if args.watch:
+        try:
+            watch_loop(extractor, args)
+        except KeyboardInterrupt:
+            print("\nStopped watching")
+        return
+
+    if extractor.extract_all_tabs(use_cache=args.cached):
         # Save as text file
         success = extractor.save_to_file(args.output)
-        
+
         # Also save as JSON if requested
         if args.json and success:
             json_filename = args.output.replace('.txt', '.json') if args.output else None
             if json_filename is None:
                 timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
                 json_filename = f"browser_tabs_{timestamp}.json"
-            
+
             try:
-                with open(json_filename, 'w', encoding='utf-8') as f:
-                    json.dump({
-                        'timestamp': datetime.now().isoformat(),
-                        'total_tabs': len(extractor.tabs),
-                        'tabs': extractor.tabs
-                    }, f, indent=2, ensure_ascii=False)
+                payload = {
+                    'timestamp': datetime.now(),
+                    'total_tabs': len(extractor.tabs),
+                    'tabs': extractor.tabs
+                }
+                if orjson is not None:
+                    # orjson serializes datetime natively and emits UTF-8
+                    # bytes from native code.
+                    with open(json_filename, 'wb') as f:
+                        f.write(orjson.dumps(payload, option=orjson.OPT_INDENT_2))
+                else:
+                    payload['timestamp'] = payload['timestamp'].isoformat()
+                    with open(json_filename, 'w', encoding='utf-8') as f:
+                        json.dump(payload, f, indent=2, ensure_ascii=False)
                 print(f"✓ JSON data saved to: {json_filename}")
             except Exception as e:
                 print(f"Error saving JSON: {e}")
-    
+
     else:
         print("Failed to extract tabs. Please ensure:")
         print("1. Your browser is currently running")